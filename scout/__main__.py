@@ -5,6 +5,11 @@ Scout Bot - Entry point.
 Usage:
     python -m scout           # Run bot
     python -m scout test      # Test detection
+    python -m scout tune DIR  # Tune detectors on labelled screenshots
+    python -m scout replay F  # Replay a recorded session
+    python -m scout stats     # Run history analytics
+    python -m scout daemon    # Run headless on all devices
+    python -m scout ctl CMD   # Control the daemon
     python -m scout --help    # Help
 """
 
@@ -28,10 +33,21 @@ def main():
 Usage:
     python -m scout           Run automation
     python -m scout test      Test screen detection
+    python -m scout tune DIR [WORKERS]
+                              Sweep detector settings over DIR/labels.json
+    python -m scout replay FILE
+                              Re-run detectors over a recorded session
+    python -m scout stats [SINCE] [UNTIL]
+                              Throughput and OVR stats (e.g. 24h, 7d, 2025-01-31)
+    python -m scout daemon    Run headless on every connected device
+    python -m scout ctl status|pause|resume|stop|start|shutdown [DEVICE]
+                              Control a running daemon
     python -m scout --help    Show help
 
 Config:
     Edit scout/config.py to change coordinates and target OVR.
+    The daemon also reads overrides from ~/.scout/config.json and
+    applies changes to it without a restart.
 """
             )
             return
@@ -41,6 +57,63 @@ Config:
                 test()
             return
 
+        if arg == "tune":
+            if len(sys.argv) < 3:
+                print("Usage: python -m scout tune DIR [WORKERS]")
+                return
+            from .tune import run_tune
+
+            try:
+                workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+            except ValueError:
+                print("Usage: python -m scout tune DIR [WORKERS]")
+                return
+            run_tune(sys.argv[2], workers)
+            return
+
+        if arg == "replay":
+            if len(sys.argv) < 3:
+                print("Usage: python -m scout replay FILE")
+                return
+            from .recorder import replay
+
+            replay(sys.argv[2])
+            return
+
+        if arg == "stats":
+            from .history import print_stats
+
+            try:
+                print_stats(*sys.argv[2:4])
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                print("Usage: python -m scout stats [SINCE] [UNTIL]  (e.g. 24h, 7d, 2025-01-31)")
+            return
+
+        if arg == "daemon":
+            from .daemon import run_daemon
+
+            run_daemon()
+            return
+
+        if arg == "ctl":
+            if len(sys.argv) < 3:
+                print("Usage: python -m scout ctl status|pause|resume|stop|start|shutdown [DEVICE]")
+                return
+            import json
+            from .daemon import send_command
+
+            try:
+                response = send_command(sys.argv[2].lower(), *sys.argv[3:4])
+            except OSError as e:
+                print(f"[ERROR] Daemon not reachable: {e}")
+                sys.exit(1)
+            except ValueError as e:
+                print(f"[ERROR] Invalid response from daemon: {e}")
+                sys.exit(1)
+            print(json.dumps(response, indent=2))
+            return
+
         print(f"Unknown: {arg}")
         return
 
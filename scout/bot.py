@@ -5,7 +5,9 @@ Bot logic for Scout.
 import time
 import random
 import shutil
+import threading
 import cv2
+import numpy as np
 from datetime import datetime
 from pathlib import Path
 
@@ -23,9 +25,21 @@ from .config import (
     DISMISS_CLICK_POS,
     DEBUG_MODE,
     DEBUG_SAVE_DIR,
+    OCR_USE_REGIONS,
+    FOUND_POLL_INTERVAL,
+    FOUND_CARD_CHANGE,
 )
-from .utils import capture_screen, tap, play_alert, check_if_image_exists, load_templates
-from .ocr import detect_screen_state, extract_ovr, is_ovr_shown
+from . import delays, history, recorder
+from .utils import (
+    capture_screen,
+    tap,
+    play_alert,
+    check_if_image_exists,
+    load_templates,
+    get_device_id,
+    crop_check_region,
+)
+from .ocr import detect_screen_state, extract_ovr, is_ovr_shown, region_boxes
 
 # Define asset paths
 ASSET_DIR = Path(__file__).parent / "assets"
@@ -33,18 +47,61 @@ ASSET_DIR = Path(__file__).parent / "assets"
 TEMPLATES = load_templates(ASSET_DIR)
 
 
+class BotControl:
+    """Pause/resume/stop switches and status of one bot loop, driven by the daemon."""
+
+    def __init__(self, device: str | None = None):
+        self.device = device
+        self.running = threading.Event()
+        self.running.set()
+        self.stopping = threading.Event()
+        self.user_paused = False  # Paused by a command, not by a found target
+        self.status = "starting"
+        self.state = None
+        self.iteration = 0
+        self.targets = 0
+
+    def pause(self) -> None:
+        self.user_paused = True
+        self.running.clear()
+
+    def resume(self) -> None:
+        self.user_paused = False
+        self.running.set()
+
+    def stop(self) -> None:
+        self.stopping.set()
+        self.running.set()  # Wake up a paused loop so it can exit
+
+    def stopped(self) -> bool:
+        return self.stopping.is_set()
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "state": self.state,
+            "iteration": self.iteration,
+            "targets": self.targets,
+        }
+
+
 def detect_with_retry(retries: int = 3) -> tuple[ScreenState, str]:
     """Capture and detect state with retries."""
+    captured_at = time.perf_counter()
     img_path = capture_screen()
 
     for i in range(retries):
+        start = time.perf_counter()
         state = detect_screen_state(img_path)
+        recorder.event("state", state.name, start)
+        delays.observe(state, captured_at)
         if state != ScreenState.UNKNOWN:
             return state, img_path
 
         if i < retries - 1:
             print(f"  [RETRY {i+1}/{retries}]")
             time.sleep(1)
+            captured_at = time.perf_counter()
             img_path = capture_screen()
 
     # Save unknown for debug
@@ -67,16 +124,21 @@ def handle_p5(img_path: str) -> bool:
     img = cv2.imread(img_path)
     if img is None:
         print(f"  [ERROR] Could not load screenshot: {img_path}")
-        return dismiss_and_check()
+        return dismiss_and_check(None)
 
-    if not is_ovr_shown(img):
+    start = time.perf_counter()
+    ovr_shown = is_ovr_shown(img)
+    recorder.event("ovr_shown", ovr_shown, start)
+    if not ovr_shown:
         print("  -> OVR not shown")
-        return dismiss_and_check()  # Returns True if special asset found
+        return dismiss_and_check(None)  # Returns True if special asset found
 
+    start = time.perf_counter()
     ovr = extract_ovr(img)
+    recorder.event("ovr", ovr, start)
     if ovr is None:
         print("  -> Could not read OVR")
-        return dismiss_and_check()
+        return dismiss_and_check(None)
 
     print(f"  -> OVR: {ovr}")
 
@@ -84,18 +146,20 @@ def handle_p5(img_path: str) -> bool:
         print(f"\n{'='*40}")
         print(f"  *** TARGET OVR FOUND: {ovr} ***")
         print(f"{'='*40}\n")
+        history.reveal(ovr, None, target=True)
         play_alert()
         # Don't exit yet, let the user decide.
         # We stop the bot but leave the final screen for manual action.
         return True
 
     print(f"  -> Not in range [{TARGET_OVR_MIN}-{TARGET_OVR_MAX}]")
-    return dismiss_and_check()
+    return dismiss_and_check(ovr)
 
 
-def dismiss_and_check() -> bool:
+def dismiss_and_check(ovr: int | None) -> bool:
     """
     Dismiss card, check for special assets, and click refresh.
+    `ovr` is the OVR read on the result screen, if any, for the run history.
     Returns True if a special asset is found, False otherwise.
     """
     print("  -> Dismiss & check for special assets")
@@ -105,7 +169,10 @@ def dismiss_and_check() -> bool:
 
     # After dismissing, capture screen to check for special assets
     img_path = capture_screen()
+    start = time.perf_counter()
     found_template, confidence = check_if_image_exists(img_path, TEMPLATES)
+    recorder.event("asset", found_template, start, confidence=round(confidence, 3))
+    history.reveal(ovr, confidence, target=found_template)
 
     if found_template:
         print(f"\n{'='*40}")
@@ -117,20 +184,80 @@ def dismiss_and_check() -> bool:
     # If no special asset, proceed with refresh
     print(f"  -> No special assets found (Max Conf: {confidence:.2f}), refreshing...")
     tap(*FREE_REFRESH_POS)
-    time.sleep(ACTION_DELAY)
+    # The card is already dismissed, so the refresh starts from the Star Scout screen
+    delays.wait_after(ScreenState.P1_MAIN, "P5_REFRESH")
 
     # Check for confirmation dialog for the refresh action
+    captured_at = time.perf_counter()
     img = capture_screen()
-    if detect_screen_state(img) == ScreenState.P6_REFRESH_CONFIRM:
+    start = time.perf_counter()
+    state = detect_screen_state(img)
+    recorder.event("state", state.name, start)
+    delays.observe(state, captured_at)
+    if state == ScreenState.P6_REFRESH_CONFIRM:
         print("  -> Confirm refresh")
         tap(*YES_BUTTON_POS)
-        time.sleep(ACTION_DELAY)
+        delays.wait_after(state)
 
     return False
 
 
-def run():
-    """Main automation loop."""
+def check_card(img: np.ndarray) -> np.ndarray | None:
+    """Grayscale card in the CHECK_ region."""
+    card = crop_check_region(img)
+    if card is None:
+        return None
+    return cv2.cvtColor(card, cv2.COLOR_BGR2GRAY)
+
+
+def card_difference(card: np.ndarray, reference: np.ndarray) -> float:
+    """Mean gray-level difference between two cards, compared to FOUND_CARD_CHANGE."""
+    return float(cv2.absdiff(card, reference).mean())
+
+
+def star_scout_card(img_path: str) -> np.ndarray | None:
+    """Grayscale card in the CHECK_ region if the screen is P1_MAIN, else None."""
+    img = cv2.imread(img_path)
+    if img is None or detect_screen_state(img) != ScreenState.P1_MAIN:
+        return None
+    return check_card(img)
+
+
+def wait_until_handled(control: BotControl) -> None:
+    """
+    Pause after a target is found until the user has handled it.
+    The found player's card is taken from the first Star Scout (P1_MAIN) screen
+    seen after the target. The bot resumes only once that screen shows a
+    different card (the player was signed or refreshed), or when told to resume.
+    A pause command given meanwhile is kept: the bot then waits for a resume.
+    """
+    print("\n*** Target Found! Waiting for it to be handled... ***")
+    control.status = "found"
+    control.running.clear()
+    history.reset_cycle()
+    delays.reset()
+
+    found_card = None
+    while True:
+        card = star_scout_card(capture_screen())
+        if card is not None:
+            if found_card is None or card.shape != found_card.shape:
+                found_card = card
+            elif card_difference(card, found_card) >= FOUND_CARD_CHANGE and not control.user_paused:
+                control.running.set()
+        if control.running.wait(FOUND_POLL_INTERVAL):
+            break
+
+    if not control.stopped():
+        print("  -> Target handled, resuming")
+
+
+def run(control: BotControl | None = None):
+    """
+    Main automation loop.
+    Without `control` the loop stops at the first target; with it (daemon mode)
+    it can be paused, resumed and stopped, and resumes once a target is handled.
+    """
     iteration = 0
     unknown_count = 0
 
@@ -140,15 +267,36 @@ def run():
     print(f"Target OVR: {TARGET_OVR_MIN}-{TARGET_OVR_MAX}")
     print("Ctrl+C to stop\n")
 
-    while True:
+    recorder.start()
+    device = get_device_id()
+    delays.start(device)
+    history.start(device)
+
+    while control is None or not control.stopped():
+        if control is not None:
+            if not control.running.is_set():
+                control.status = "paused"
+                history.reset_cycle()
+                delays.reset()
+                control.running.wait()
+                continue
+            control.status = "running"
+
         iteration += 1
         print(f"\n[{iteration}] Checking...")
+        if control is not None:
+            control.iteration = iteration
+        recorder.event("iteration", iteration)
+        iter_start = time.perf_counter()
 
         try:
             state, img_path = detect_with_retry()
             print(f"  State: {state.name}")
+            if control is not None:
+                control.state = state.name
 
             if state == ScreenState.UNKNOWN:
+                history.stage(state.name, time.perf_counter() - iter_start)
                 unknown_count += 1
                 if unknown_count >= 5:
                     print("  [WARN] Too many unknowns, waiting...")
@@ -161,33 +309,42 @@ def run():
             if state == ScreenState.P1_MAIN:
                 print("  -> FREE REVEAL")
                 tap(*FREE_REVEAL_POS)
-                time.sleep(ACTION_DELAY)
+                delays.wait_after(state)
 
             elif state == ScreenState.P2_CONFIRM:
                 print("  -> YES")
                 tap(*YES_BUTTON_POS)
-                time.sleep(ACTION_DELAY)
+                delays.wait_after(state)
 
             elif state == ScreenState.P3_TILES:
                 tile = random.choice(TILE_POSITIONS)
                 print(f"  -> Tile {tile}")
                 tap(*tile)
-                time.sleep(ACTION_DELAY)
+                delays.wait_after(state)
 
             elif state == ScreenState.P4_SKIP:
                 print("  -> SKIP")
                 tap(*SKIP_BUTTON_POS)
-                time.sleep(ACTION_DELAY)
+                delays.wait_after(state)
 
             elif state == ScreenState.P5_RESULT:
-                if handle_p5(img_path):
+                found = handle_p5(img_path)
+                history.stage(state.name, time.perf_counter() - iter_start)
+                if found:
+                    if control is not None:
+                        control.targets += 1
+                        wait_until_handled(control)
+                        continue
                     print("\n*** Target Found! Bot stopped. ***")
                     print("You can manually accept or refresh the player.")
                     break
             elif state == ScreenState.P6_REFRESH_CONFIRM:
                 print("  -> Confirm refresh")
                 tap(*YES_BUTTON_POS)
-                time.sleep(ACTION_DELAY)
+                delays.wait_after(state)
+
+            if state != ScreenState.P5_RESULT:
+                history.stage(state.name, time.perf_counter() - iter_start)
 
         except KeyboardInterrupt:
             print("\n\nStopped.")
@@ -196,16 +353,49 @@ def run():
             print(f"  [ERROR] {e}")
             time.sleep(ACTION_DELAY)
 
+    history.stop()
+    delays.stop()
+    recorder.stop()
+
 
 def test():
     """Test current screen detection."""
     print("\n[TEST] Capturing...")
     img = capture_screen()
 
+    if OCR_USE_REGIONS:
+        frame = cv2.imread(img)
+        if frame is not None:
+            boxes = region_boxes(frame.shape)
+            pixels = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in boxes.values())
+            print(f"[TEST] OCR regions cover {pixels / (frame.shape[0] * frame.shape[1]):.1%} of the screen")
+            for name, (x1, y1, x2, y2) in boxes.items():
+                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
+                cv2.putText(frame, name, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+            DEBUG_SAVE_DIR.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(DEBUG_SAVE_DIR / "regions.png"), frame)
+            print(f"[TEST] Saved: {DEBUG_SAVE_DIR}/regions.png")
+
     print("[TEST] Detecting...")
     state = detect_screen_state(img, debug=True)
     print(f"\n[TEST] State: {state.name}")
 
+    if state == ScreenState.P1_MAIN:
+        frame = cv2.imread(img)
+        card = check_card(frame) if frame is not None else None
+        if card is not None:
+            # Calibrate FOUND_CARD_CHANGE against the card saved by the previous test
+            card_path = DEBUG_SAVE_DIR / "card.png"
+            previous = cv2.imread(str(card_path), cv2.IMREAD_GRAYSCALE) if card_path.exists() else None
+            if previous is not None and previous.shape == card.shape:
+                print(
+                    f"[TEST] Card difference from previous test: {card_difference(card, previous):.1f} "
+                    f"(FOUND_CARD_CHANGE = {FOUND_CARD_CHANGE})"
+                )
+            DEBUG_SAVE_DIR.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(card_path), card)
+            print(f"[TEST] Saved card: {card_path}")
+
     if state == ScreenState.P5_RESULT:
         ovr = extract_ovr(img)
         print(f"[TEST] OVR: {ovr}")
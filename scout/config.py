@@ -31,6 +31,13 @@ CLICK_DELAY = 0.3
 ACTION_DELAY = 0.8
 OCR_DELAY = 0.5
 
+# Adaptive delays: learn the wait after each action per device, starting from
+# ACTION_DELAY. Learned timings are kept between runs in ADAPTIVE_DELAY_FILE.
+ADAPTIVE_DELAY = True
+ADAPTIVE_DELAY_MIN = 0.2
+ADAPTIVE_DELAY_MAX = 3.0
+ADAPTIVE_DELAY_FILE = Path.home() / ".scout" / "delays.json"
+
 # Alert sound file
 ALERT_SOUND = Path(__file__).parent / "alert.wav"
 
@@ -79,6 +86,89 @@ CHECK_Y2 = 796  # LOWER RIGHT AREA Y
 # Threshold for template matching (0..1). Increase for stricter matching.
 MATCH_THRESHOLD = 0.49
 
+# Template scales tried, as a fraction of the check region height (min, max, steps).
+# Fewer steps / a narrower range is faster. Use `python -m scout tune` to pick them.
+TEMPLATE_SCALE_MIN = 0.6
+TEMPLATE_SCALE_MAX = 1.4
+TEMPLATE_SCALE_STEPS = 40
+
+# ==================== OVR OCR ====================
+# Binarization thresholds used to read the OVR number off the result card
+OVR_THRESHOLDS = [100, 120, 140]
+
+# Also OCR the full screenshot as a fallback (slowest pass)
+OVR_FULL_FALLBACK = True
+
+# ==================== OCR REGIONS ====================
+# OCR only these text regions instead of the whole screen when detecting the
+# screen state. Each region is read on its own as a single line of text, in
+# parallel. Regions are (x1, y1, x2, y2) as fractions of the screen size.
+# Check them with `python -m scout test`, which prints the text of every region
+# and saves an image with the regions drawn to DEBUG_SAVE_DIR/regions.png.
+OCR_USE_REGIONS = False
+OCR_REGIONS = {
+    "title": (0.02, 0.02, 0.20, 0.08),  # STAR SCOUT
+    "prompt": (0.40, 0.14, 0.60, 0.19),  # PICK ANY CLUE BOX
+    "dialog": (0.38, 0.36, 0.62, 0.42),  # REVEAL CLUE? / REFRESH THIS PLAYER?
+    "button": (0.44, 0.83, 0.56, 0.88),  # FREE REVEAL
+    "swipe": (0.40, 0.88, 0.60, 0.93),  # SWIPE TO REVEAL
+    "card_ovr": (0.42, 0.26, 0.58, 0.30),  # OVR
+    "card_trade": (0.40, 0.76, 0.60, 0.80),  # TRADABILITY / UNTRADABLE
+}
+# Region each screen keyword must appear in. Keywords not listed here are
+# only matched when the full screen is read (OCR_USE_REGIONS = False).
+OCR_KEYWORD_REGIONS = {
+    "STAR SCOUT": "title",
+    "PICK ANY CLUE": "prompt",
+    "REVEAL CLUE": "dialog",
+    "REFRESH THIS": "dialog",
+    "FREE REVEAL": "button",
+    "SWIPE": "swipe",
+    "OVR": "card_ovr",
+    "OOVR": "card_ovr",
+    "0VR": "card_ovr",
+    "OVVR": "card_ovr",
+    "TRADABILITY": "card_trade",
+    "UNTRADABLE": "card_trade",
+    "TRADABLE": "card_trade",
+}
+# Characters Tesseract may output for a region (no spaces)
+OCR_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789?"
+# Threads used to OCR regions in parallel
+OCR_WORKERS = 4
+
 # ==================== DEBUG ====================
 DEBUG_MODE = True
 DEBUG_SAVE_DIR = Path(tempfile.gettempdir()) / "scout_debug"
+
+# ==================== HISTORY ====================
+# Store every reveal and stage timing for `python -m scout stats`
+HISTORY_ENABLED = True
+HISTORY_DB = Path.home() / ".scout" / "history.db"
+
+# ==================== DAEMON ====================
+# `python -m scout daemon` runs one bot per connected device in the background.
+# Any setting in this file can be overridden in DAEMON_CONFIG_FILE (JSON, e.g.
+# {"TARGET_OVR_MIN": 113, "ACTION_DELAY": 0.6}); changes apply without a restart.
+DAEMON_CONFIG_FILE = Path.home() / ".scout" / "config.json"
+# Local control socket used by `python -m scout ctl` (readable by its owner only)
+DAEMON_SOCKET = Path.home() / ".scout" / "scout.sock"
+# Seconds between config file checks / new device scans
+DAEMON_POLL_INTERVAL = 1.0
+DAEMON_SCAN_INTERVAL = 10.0
+# After a target is found, seconds between checks for the user having handled it
+FOUND_POLL_INTERVAL = 3.0
+# Mean gray-level difference (0-255) of the card in the CHECK_ region that
+# counts as a different player on the Star Scout screen. To calibrate, run
+# `python -m scout test` on the Star Scout screen twice for the same player
+# (capture noise) and once after a refresh (a new player); it prints the
+# difference from the previous run. Pick a value between the two.
+FOUND_CARD_CHANGE = 25.0
+
+# ==================== RECORDING ====================
+# Record every frame, detection, tap and timing to a session file.
+# Replay it with: python -m scout replay <session file>
+RECORD_SESSION = False
+RECORD_DIR = Path(tempfile.gettempdir()) / "scout_sessions"
+# Store a full frame every N frames; frames in between are stored as deltas
+RECORD_KEYFRAME_INTERVAL = 30
@@ -0,0 +1,272 @@
+"""
+Headless daemon for Scout Bot.
+
+Keeps the warm state (loaded templates, OCR setup, one bot loop per ADB device)
+running between targets, hot-reloads config overrides from DAEMON_CONFIG_FILE
+and takes commands on a local Unix socket. Each request and response is one
+line of JSON:
+
+    {"cmd": "status"}
+    {"cmd": "pause", "device": "<serial>"}    # Without "device": all devices
+    {"cmd": "resume"} / {"cmd": "stop"} / {"cmd": "start"}
+    {"cmd": "shutdown"}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+from . import config
+from .bot import BotControl, run
+from .config import (
+    DAEMON_CONFIG_FILE,
+    DAEMON_SOCKET,
+    DAEMON_POLL_INTERVAL,
+    DAEMON_SCAN_INTERVAL,
+)
+from .device import set_device
+from .utils import list_devices
+
+# Settings as written in config.py, before any override
+_DEFAULTS = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+
+
+def _coerce(value, default):
+    """
+    Convert a JSON value to the type of the config.py default.
+    Ints are accepted for float settings; bools only for bool settings.
+    Raises TypeError if the value does not fit.
+    """
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+    elif isinstance(default, (int, float)):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if isinstance(default, float):
+                return float(value)
+            if isinstance(value, int):
+                return value
+    elif isinstance(default, (str, Path)):
+        if isinstance(value, str):
+            return type(default)(value)
+    elif isinstance(default, tuple):
+        if isinstance(value, list) and len(value) == len(default):
+            return tuple(_coerce(v, d) for v, d in zip(value, default))
+    elif isinstance(default, list):
+        if isinstance(value, list):
+            return [_coerce(v, default[0]) for v in value] if default else value
+    elif isinstance(default, dict):
+        if isinstance(value, dict):
+            sample = next(iter(default.values()), None)
+            return {k: _coerce(v, sample) for k, v in value.items()} if default else value
+    raise TypeError(f"expected {type(default).__name__}, got {json.dumps(value)}")
+
+
+def apply_overrides(overrides: dict) -> list[str]:
+    """
+    Apply config overrides on top of the config.py defaults.
+    Settings are imported by name across the package, so every loaded scout
+    module holding the setting is updated. Returns the names that changed.
+    """
+    wanted = dict(_DEFAULTS)
+    for name, value in overrides.items():
+        if name not in _DEFAULTS:
+            print(f"[WARN] Unknown config key: {name}")
+            continue
+        try:
+            wanted[name] = _coerce(value, _DEFAULTS[name])
+        except TypeError as e:
+            print(f"[WARN] Invalid value for {name}: {e}")
+
+class ConfigWatcher:
+    """Reloads DAEMON_CONFIG_FILE whenever its modification time changes."""
+
+    def __init__(self, path: Path = DAEMON_CONFIG_FILE):
+        self.path = path
+        self.mtime = None
+
+    def poll(self) -> None:
+        mtime = self.path.stat().st_mtime if self.path.exists() else None
+        if mtime == self.mtime:
+            return
+        self.mtime = mtime
+
+        overrides = {}
+        if mtime is not None:
+            try:
+                overrides = json.loads(self.path.read_text())
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Could not load {self.path}: {e}")
+                return
+            if not isinstance(overrides, dict):
+                print(f"[WARN] {self.path} must contain a JSON object")
+                return
+
+        changed = apply_overrides(overrides)
+        if changed:
+            print(f"[INFO] Config reloaded: {', '.join(changed)}")
+
+
+class Daemon:
+    """One bot loop per connected device, controlled through the socket."""
+
+    def __init__(self):
+        self.sessions: dict[str, tuple[BotControl, threading.Thread]] = {}
+        # Reentrant: handle() holds it while calling start_device()
+        self.lock = threading.RLock()
+        self.shutdown_event = threading.Event()
+
+    def _session(self, control: BotControl) -> None:
+        set_device(control.device)
+        try:
+            run(control)
+        finally:
+            control.status = "stopped"
+
+    def start_device(self, serial: str) -> None:
+        with self.lock:
+            session = self.sessions.get(serial)
+            if session is not None and session[1].is_alive():
+                return
+            control = BotControl(serial)
+            thread = threading.Thread(
+                target=self._session, args=(control,), name=f"scout-{serial}", daemon=True
+            )
+            self.sessions[serial] = (control, thread)
+            thread.start()
+        print(f"[INFO] Started bot on {serial}")
+
+    def scan_devices(self) -> None:
+        """Start a bot on every newly connected device."""
+        for serial in list_devices():
+            if serial not in self.sessions:
+                self.start_device(serial)
+
+    def handle(self, request) -> dict:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object"}
+        cmd = request.get("cmd")
+        device = request.get("device")
+        if device is not None and not isinstance(device, str):
+            return {"ok": False, "error": "Device must be a string"}
+
+        if cmd == "shutdown":
+            self.shutdown_event.set()
+            return {"ok": True}
+
+        with self.lock:
+            if device is not None and device not in self.sessions:
+                return {"ok": False, "error": f"Unknown device: {device}"}
+            serials = [device] if device is not None else list(self.sessions)
+
+            if cmd == "start":
+                for serial in serials:
+                    self.start_device(serial)
+            elif cmd in ("pause", "resume", "stop"):
+                for serial in serials:
+                    getattr(self.sessions[serial][0], cmd)()
+            elif cmd != "status":
+                return {"ok": False, "error": f"Unknown command: {cmd}"}
+
+            return {
+                "ok": True,
+                "devices": {serial: self.sessions[serial][0].to_dict() for serial in serials},
+            }
+
+    def stop_all(self) -> None:
+        with self.lock:
+            sessions = list(self.sessions.values())
+        for control, _ in sessions:
+            control.stop()
+        for _, thread in sessions:
+            thread.join()
+
+
+def _make_server(daemon: Daemon, path: Path) -> socketserver.BaseServer:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    response = daemon.handle(json.loads(line))
+                except ValueError as e:
+                    response = {"ok": False, "error": str(e)}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    return Server(str(path), Handler)
+
+
+def run_daemon() -> None:
+    """Run bots on all connected devices until shut down."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("[ERROR] Daemon mode needs Unix socket support")
+        return
+
+    socket_path = DAEMON_SOCKET
+    if socket_path.exists():
+        try:
+            send_command("status")
+            print(f"[ERROR] Daemon already running on {socket_path}")
+            return
+        except (OSError, ValueError):
+            pass
+        try:
+            socket_path.unlink()
+        except OSError as e:
+            print(f"[ERROR] Cannot remove stale socket {socket_path}: {e}")
+            return
+
+    watcher = ConfigWatcher()
+    watcher.poll()
+
+    daemon = Daemon()
+    try:
+        socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        server = _make_server(daemon, socket_path)
+        # Only the owner may control the bots
+        os.chmod(socket_path, 0o600)
+    except OSError as e:
+        print(f"[ERROR] Cannot open control socket {socket_path}: {e}")
+        return
+    threading.Thread(target=server.serve_forever, name="scout-control", daemon=True).start()
+    print(f"[INFO] Control socket: {socket_path}")
+
+    daemon.scan_devices()
+    if not daemon.sessions:
+        print("[WARN] No ADB device yet, waiting...")
+
+    last_scan = time.monotonic()
+    try:
+        while not daemon.shutdown_event.wait(DAEMON_POLL_INTERVAL):
+            watcher.poll()
+            if time.monotonic() - last_scan >= DAEMON_SCAN_INTERVAL:
+                daemon.scan_devices()
+                last_scan = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+
+    print("\nStopping...")
+    server.shutdown()
+    server.server_close()
+    socket_path.unlink(missing_ok=True)
+    daemon.stop_all()
+
+
+def send_command(cmd: str, device: str | None = None) -> dict:
+    """Send one command to a running daemon and return its response."""
+    request = {"cmd": cmd}
+    if device is not None:
+        request["device"] = device
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(DAEMON_SOCKET))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
@@ -0,0 +1,209 @@
+"""
+Adaptive per-transition delays for Scout Bot.
+
+After each action the bot waits a learned delay instead of ACTION_DELAY.
+Every capture that follows the action bounds how long the transition took:
+
+    - still the old state or UNKNOWN -> the screen was not ready yet (lower bound)
+    - a new recognized state         -> the screen was ready by then (upper bound)
+
+Clean transitions shrink the wait a little; the wait never drops below a high
+percentile of the lower bounds, and backs off whenever retries or UNKNOWN
+states start to rise, up to a high percentile of the upper bounds.
+Statistics are kept per device and persisted between runs.
+"""
+
+import json
+import threading
+import time
+
+import numpy as np
+
+from .config import (
+    ScreenState,
+    ACTION_DELAY,
+    ADAPTIVE_DELAY,
+    ADAPTIVE_DELAY_MIN,
+    ADAPTIVE_DELAY_MAX,
+    ADAPTIVE_DELAY_FILE,
+)
+from .device import current_device
+
+SHRINK = 0.95  # Multiplier applied after a clean transition
+BACKOFF = 1.3  # Multiplier applied after a retry / UNKNOWN
+SAFETY = 1.1  # Margin kept above the percentile of lower bounds
+PERCENTILE = 95
+MAX_FAILURE_RATE = 0.1  # Stop shrinking above this rate of failed transitions
+SAMPLE_WINDOW = 50
+OUTCOME_WINDOW = 20
+SAVE_EVERY = 20
+
+
+class TransitionStats:
+    """Learned wait and recent observations for one action."""
+
+    def __init__(self, data: dict | None = None):
+        data = data or {}
+        self.delay = data.get("delay", ACTION_DELAY)
+        self.lower = data.get("lower", [])  # Not ready yet after this many seconds
+        self.upper = data.get("upper", [])  # Ready after this many seconds
+        self.outcomes = data.get("outcomes", [])  # True = no retry / UNKNOWN
+
+    def to_dict(self) -> dict:
+        return {
+            "delay": round(self.delay, 3),
+            "lower": self.lower,
+            "upper": self.upper,
+            "outcomes": self.outcomes,
+        }
+
+    def floor(self) -> float:
+        """Smallest wait still above the high percentile of observed render times."""
+        if not self.lower:
+            return ADAPTIVE_DELAY_MIN
+        return max(ADAPTIVE_DELAY_MIN, float(np.percentile(self.lower, PERCENTILE)) * SAFETY)
+
+    def ceiling(self) -> float:
+        """Longest useful wait: the screen was ready by the high percentile of upper bounds."""
+        if not self.upper:
+            return ADAPTIVE_DELAY_MAX
+        ready = float(np.percentile(self.upper, PERCENTILE)) * SAFETY
+        return min(ADAPTIVE_DELAY_MAX, max(self.floor(), ready))
+
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def update(self, clean: bool, lower: list[float], upper: float | None) -> None:
+        """Record one finished transition and adjust the wait."""
+        self.lower = (self.lower + [round(x, 3) for x in lower])[-SAMPLE_WINDOW:]
+        if upper is not None:
+            self.upper = (self.upper + [round(upper, 3)])[-SAMPLE_WINDOW:]
+        self.outcomes = (self.outcomes + [clean])[-OUTCOME_WINDOW:]
+
+        if not clean:
+            self.delay *= BACKOFF
+        elif self.failure_rate() <= MAX_FAILURE_RATE:
+            self.delay *= SHRINK
+        self.delay = min(self.ceiling(), max(self.floor(), self.delay))
+
+
+class DelayTuner:
+    """Per-device transition statistics and the action currently being timed."""
+
+    def __init__(self, device: str):
+        self.device = device
+        self.stats: dict[str, TransitionStats] = {}
+        self.pending = None  # (action, from_state, tapped_at, lower_bounds)
+        self.updates = 0
+
+    def load(self) -> None:
+        if not ADAPTIVE_DELAY_FILE.exists():
+            return
+        try:
+            data = json.loads(ADAPTIVE_DELAY_FILE.read_text())
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not load delays: {e}")
+            return
+        for action, stats in data.get(self.device, {}).items():
+            self.stats[action] = TransitionStats(stats)
+        if self.stats:
+            print(f"[INFO] Loaded learned delays for {self.device}: {self.summary()}")
+
+    def save(self) -> None:
+        data = {}
+        if ADAPTIVE_DELAY_FILE.exists():
+            try:
+                data = json.loads(ADAPTIVE_DELAY_FILE.read_text())
+            except (OSError, ValueError):
+                data = {}
+        data[self.device] = {action: s.to_dict() for action, s in self.stats.items()}
+        ADAPTIVE_DELAY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        ADAPTIVE_DELAY_FILE.write_text(json.dumps(data, indent=2))
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{a}={s.delay:.2f}s (floor {s.floor():.2f}s, ceiling {s.ceiling():.2f}s)"
+            for a, s in sorted(self.stats.items())
+        )
+
+    def _finish(self, clean: bool, upper: float | None) -> None:
+        action, _, _, lower = self.pending
+        self.pending = None
+        self.stats.setdefault(action, TransitionStats()).update(clean, lower, upper)
+        self.updates += 1
+        if self.updates % SAVE_EVERY == 0:
+            with _file_lock:
+                self.save()
+
+    def wait_after(self, action: str, from_state: ScreenState) -> None:
+        if self.pending is not None:
+            # The previous action never reached a new state (e.g. the tap was lost)
+            self._finish(clean=False, upper=None)
+        delay = self.stats.setdefault(action, TransitionStats()).delay
+        self.pending = (action, from_state, time.perf_counter(), [])
+        time.sleep(delay)
+
+    def observe(self, state: ScreenState, captured_at: float) -> None:
+        if self.pending is None:
+            return
+        _, from_state, tapped_at, lower = self.pending
+        elapsed = captured_at - tapped_at
+        if state == ScreenState.UNKNOWN or state == from_state:
+            lower.append(elapsed)
+            return
+        self._finish(clean=not lower, upper=elapsed)
+
+
+# Active tuner per selected device (None = default ADB device)
+_tuners: dict[str | None, DelayTuner] = {}
+_file_lock = threading.Lock()
+
+
+def start(device: str) -> None:
+    """Load the learned delays for `device` if ADAPTIVE_DELAY is enabled."""
+    if not ADAPTIVE_DELAY:
+        return
+    tuner = DelayTuner(device)
+    with _file_lock:
+        tuner.load()
+    _tuners[current_device()] = tuner
+
+
+def stop() -> None:
+    """Persist the learned delays."""
+    tuner = _tuners.pop(current_device(), None)
+    if tuner is not None:
+        with _file_lock:
+            tuner.save()
+        print(f"[INFO] Learned delays: {tuner.summary()}")
+
+
+def wait_after(from_state: ScreenState, action: str | None = None) -> None:
+    """
+    Sleep after an action taken on `from_state` and start timing its transition.
+    Falls back to ACTION_DELAY when adaptive delays are disabled.
+    Args:
+        from_state: Screen state the action was taken on.
+        action: Stats key if one state has several actions (default: state name).
+    """
+    tuner = _tuners.get(current_device())
+    if tuner is None:
+        time.sleep(ACTION_DELAY)
+        return
+    tuner.wait_after(action or from_state.name, from_state)
+
+
+def reset() -> None:
+    """Drop the transition being timed, e.g. when the bot pauses after an action."""
+    tuner = _tuners.get(current_device())
+    if tuner is not None:
+        tuner.pending = None
+
+
+def observe(state: ScreenState, captured_at: float) -> None:
+    """Report a state detected on a capture started at `captured_at` (perf_counter)."""
+    tuner = _tuners.get(current_device())
+    if tuner is not None:
+        tuner.observe(state, captured_at)
@@ -0,0 +1,28 @@
+"""
+ADB device selection for Scout Bot.
+
+Each thread can drive its own device. Without a selected device, commands go
+to the default ADB device, as with a plain `adb` call.
+"""
+
+import threading
+
+_local = threading.local()
+
+
+def set_device(serial: str | None) -> None:
+    """Select the ADB device used by the current thread."""
+    _local.serial = serial
+
+
+def current_device() -> str | None:
+    """Serial selected for the current thread, or None for the default device."""
+    return getattr(_local, "serial", None)
+
+
+def adb(args: str) -> str:
+    """Build an adb command line for the current thread's device."""
+    serial = current_device()
+    if serial:
+        return f"adb -s {serial} {args}"
+    return f"adb {args}"
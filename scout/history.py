@@ -0,0 +1,255 @@
+"""
+Run history store for Scout Bot.
+
+Every reveal (OVR read, asset confidence, cycle time) and the time spent on
+each screen state is written to a SQLite database in WAL mode. Rows are queued
+and inserted in batches by a background thread, so the bot loop never waits
+on disk.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .config import HISTORY_ENABLED, HISTORY_DB
+from .device import current_device
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 2.0  # Seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reveals (
+    ts REAL NOT NULL,
+    device TEXT NOT NULL,
+    ovr INTEGER,
+    asset_conf REAL,
+    target INTEGER NOT NULL,
+    cycle_time REAL
+);
+CREATE INDEX IF NOT EXISTS reveals_ts ON reveals (ts);
+CREATE INDEX IF NOT EXISTS reveals_device_ts ON reveals (device, ts);
+
+CREATE TABLE IF NOT EXISTS stages (
+    ts REAL NOT NULL,
+    device TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stages_ts ON stages (ts);
+CREATE INDEX IF NOT EXISTS stages_device_ts ON stages (device, ts);
+"""
+
+_INSERT = {
+    "reveals": "INSERT INTO reveals VALUES (?, ?, ?, ?, ?, ?)",
+    "stages": "INSERT INTO stages VALUES (?, ?, ?, ?)",
+}
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open the history database in WAL mode, creating the schema if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class HistoryWriter:
+    """Background thread that inserts queued rows in batches."""
+
+    def __init__(self, device: str, path: Path):
+        self.device = device
+        self.path = path
+        self.queue: queue.Queue = queue.Queue()
+        self.last_reveal: float | None = None
+        self.failed = False
+        self.thread = threading.Thread(target=self._run, name="scout-history", daemon=True)
+        self.thread.start()
+
+    def put(self, table: str, row: tuple) -> None:
+        # Rows queued after a failed write would never be consumed
+        if not self.failed:
+            self.queue.put((table, row))
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+
+    def _flush(self, conn: sqlite3.Connection, batch: list[tuple[str, tuple]]) -> None:
+        if not batch:
+            return
+        with conn:
+            for table, sql in _INSERT.items():
+                rows = [row for t, row in batch if t == table]
+                if rows:
+                    conn.executemany(sql, rows)
+        batch.clear()
+
+    def _run(self) -> None:
+        conn = None
+        batch: list[tuple[str, tuple]] = []
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        try:
+            conn = connect(self.path)
+            while True:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = ()
+
+                if item is None:
+                    break
+                if item:
+                    batch.append(item)
+
+                if len(batch) >= BATCH_SIZE or time.monotonic() >= deadline:
+                    self._flush(conn, batch)
+                    deadline = time.monotonic() + FLUSH_INTERVAL
+            self._flush(conn, batch)
+        except (OSError, sqlite3.Error) as e:
+            self.failed = True
+            print(f"[WARN] History write failed, history disabled for this run: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+# Active writer per selected device (None = default ADB device)
+_writers: dict[str | None, HistoryWriter] = {}
+
+
+def start(device: str) -> None:
+    """Start recording run history for `device` if HISTORY_ENABLED is set."""
+    if HISTORY_ENABLED and current_device() not in _writers:
+        _writers[current_device()] = HistoryWriter(device, HISTORY_DB)
+
+
+def stop() -> None:
+    """Flush pending rows and stop the writer thread."""
+    writer = _writers.pop(current_device(), None)
+    if writer is not None:
+        writer.close()
+
+
+def reveal(ovr: int | None, asset_conf: float | None, target: bool) -> None:
+    """Record one revealed player."""
+    writer = _writers.get(current_device())
+    if writer is None:
+        return
+    now = time.time()
+    cycle_time = None if writer.last_reveal is None else now - writer.last_reveal
+    writer.last_reveal = now
+    writer.put("reveals", (now, writer.device, ovr, asset_conf, int(target), cycle_time))
+
+
+def reset_cycle() -> None:
+    """Start a new cycle after a pause, so the pause is not counted as cycle time."""
+    writer = _writers.get(current_device())
+    if writer is not None:
+        writer.last_reveal = None
+
+
+def stage(name: str, seconds: float) -> None:
+    """Record time spent handling one screen state."""
+    writer = _writers.get(current_device())
+    if writer is not None:
+        writer.put("stages", (time.time(), writer.device, name, seconds))
+
+
+def parse_time(value: str, now: datetime) -> datetime:
+    """Parse '30m', '24h', '7d' (relative to now) or an ISO date/time."""
+    units = {"m": "minutes", "h": "hours", "d": "days"}
+    if value[-1:].lower() in units and value[:-1].replace(".", "", 1).isdigit():
+        return now - timedelta(**{units[value[-1].lower()]: float(value[:-1])})
+    return datetime.fromisoformat(value)
+
+
+def print_stats(since: str = "24h", until: str | None = None, path: Path | None = None) -> None:
+    """Print throughput, stage timings, OVR distribution and hit rates for a window."""
+    path = HISTORY_DB if path is None else path
+    if not path.exists():
+        print(f"[ERROR] No history yet: {path}")
+        return
+
+    now = datetime.now()
+    start_ts = parse_time(since, now).timestamp()
+    end_ts = parse_time(until, now).timestamp() if until else now.timestamp()
+    window = (start_ts, end_ts)
+
+    conn = connect(path)
+    try:
+        print(f"\n{'='*40}")
+        print(
+            f"Stats {datetime.fromtimestamp(start_ts):%Y-%m-%d %H:%M} -> "
+            f"{datetime.fromtimestamp(end_ts):%Y-%m-%d %H:%M}"
+        )
+        print(f"{'='*40}")
+
+        # Active time = time spent handling screens, excluding stops and pauses
+        active = dict(
+            conn.execute(
+                "SELECT device, SUM(seconds) FROM stages WHERE ts BETWEEN ? AND ? GROUP BY device",
+                window,
+            )
+        )
+
+        rows = conn.execute(
+            """
+            SELECT device, COUNT(*), AVG(cycle_time),
+                   SUM(ovr IS NOT NULL), SUM(asset_conf IS NOT NULL), SUM(target)
+            FROM reveals WHERE ts BETWEEN ? AND ? GROUP BY device
+            """,
+            window,
+        ).fetchall()
+        if not rows:
+            print("No reveals in this window.")
+            return
+
+        print("\nThroughput:")
+        for device, count, cycle, ovr_read, asset_checked, targets in rows:
+            hours = (active.get(device) or 0.0) / 3600
+            rate = count / hours if hours > 0 else 0.0
+            cycle_str = f"{cycle:.1f}s" if cycle is not None else "-"
+            print(
+                f"  {device}: {count} reveals in {hours:.1f}h active, {rate:.1f}/hour, "
+                f"avg cycle {cycle_str}"
+            )
+            print(
+                f"    OVR read {ovr_read / count:.1%}, asset checked {asset_checked / count:.1%}, "
+                f"targets {targets} ({targets / count:.2%})"
+            )
+
+        print("\nTime per stage:")
+        for name, count, avg, total in conn.execute(
+            """
+            SELECT stage, COUNT(*), AVG(seconds), SUM(seconds)
+            FROM stages WHERE ts BETWEEN ? AND ? GROUP BY stage ORDER BY stage
+            """,
+            window,
+        ):
+            print(f"  {name:<20} {count:>6}x  avg {avg:.2f}s  total {total / 60:.1f} min")
+
+        print("\nOVR distribution:")
+        dist = conn.execute(
+            """
+            SELECT ovr, COUNT(*) FROM reveals
+            WHERE ts BETWEEN ? AND ? AND ovr IS NOT NULL GROUP BY ovr ORDER BY ovr
+            """,
+            window,
+        ).fetchall()
+        peak = max((count for _, count in dist), default=0)
+        for ovr, count in dist:
+            bar = "#" * max(1, round(30 * count / peak))
+            print(f"  {ovr:>3} {count:>6} {bar}")
+
+        (max_conf,) = conn.execute(
+            "SELECT MAX(asset_conf) FROM reveals WHERE ts BETWEEN ? AND ?", window
+        ).fetchone()
+        if max_conf is not None:
+            print(f"\nHighest asset confidence: {max_conf:.2f}")
+    finally:
+        conn.close()
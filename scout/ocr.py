@@ -3,22 +3,102 @@ OCR functions for Scout Bot using pytesseract.
 """
 
 import re
+import threading
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 import numpy as np
 from PIL import Image
 import pytesseract
 
-from .config import ScreenState
+from .config import (
+    ScreenState,
+    OVR_THRESHOLDS,
+    OVR_FULL_FALLBACK,
+    OCR_USE_REGIONS,
+    OCR_REGIONS,
+    OCR_KEYWORD_REGIONS,
+    OCR_WHITELIST,
+    OCR_WORKERS,
+)
+
+# Key of the full-screen text when OCR_USE_REGIONS is off
+FULL_SCREEN = "screen"
+
+_region_pool: ThreadPoolExecutor | None = None
+_region_pool_workers = 0
+_region_pool_lock = threading.Lock()
+
+
+def region_boxes(shape: tuple[int, ...]) -> dict[str, tuple[int, int, int, int]]:
+    """Pixel boxes (x1, y1, x2, y2) of OCR_REGIONS for an image of `shape`."""
+    h, w = shape[:2]
+    return {
+        name: (int(x1 * w), int(y1 * h), int(x2 * w), int(y2 * h))
+        for name, (x1, y1, x2, y2) in OCR_REGIONS.items()
+    }
+
+
+def read_region(gray: np.ndarray, box: tuple[int, int, int, int]) -> str:
+    """Binarize one region and read it as a single line of text."""
+    x1, y1, x2, y2 = box
+    crop = gray[y1:y2, x1:x2]
+    if crop.size == 0:
+        return ""
+    _, thresh = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Single text line (PSM 7), LSTM only, restricted character set
+    config = f"--psm 7 --oem 1 -c tessedit_char_whitelist={OCR_WHITELIST}"
+    return pytesseract.image_to_string(Image.fromarray(thresh), config=config).upper().strip()
+
+
+def _get_region_pool() -> ThreadPoolExecutor:
+    """Shared region OCR pool, recreated when OCR_WORKERS changes on a config reload."""
+    global _region_pool, _region_pool_workers
+
+    with _region_pool_lock:
+        if _region_pool is None or _region_pool_workers != OCR_WORKERS:
+            # Other device threads may still be mapping on the old pool; its
+            # workers exit once the last reference to it is dropped
+            _region_pool = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="scout-ocr")
+            _region_pool_workers = OCR_WORKERS
+        return _region_pool
+
+
+def get_region_texts(image: str | np.ndarray) -> dict[str, str]:
+    """
+    OCR every region in OCR_REGIONS on its own, in parallel.
+    Args:
+        image: File path (str) or loaded OpenCV image (np.ndarray).
+    Returns:
+        {region_name: text}
+    """
+    if isinstance(image, str):
+        img = cv2.imread(image)
+    else:
+        img = image
+
+    if img is None:
+        return {}
+
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    boxes = region_boxes(gray.shape)
+
+    # Tesseract runs as a subprocess, so threads read regions in parallel
+    texts = _get_region_pool().map(lambda box: read_region(gray, box), boxes.values())
+    return dict(zip(boxes, texts))
 
 
 def get_text(image: str | np.ndarray) -> str:
     """
     Extract text from screenshot - optimized for speed.
+    With OCR_USE_REGIONS, only the configured text regions are read.
     Args:
         image: File path (str) or loaded OpenCV image (np.ndarray).
     """
+    if OCR_USE_REGIONS:
+        return "\n".join(get_region_texts(image).values())
+
     if isinstance(image, str):
         img = cv2.imread(image)
     else:
@@ -43,29 +123,56 @@ def get_text(image: str | np.ndarray) -> str:
     return text
 
 
+def get_texts(image: str | np.ndarray) -> dict[str, str]:
+    """OCR text per region, or {FULL_SCREEN: text} when OCR_USE_REGIONS is off."""
+    if OCR_USE_REGIONS:
+        return get_region_texts(image)
+    return {FULL_SCREEN: get_text(image)}
+
+
 def detect_screen_state(image: str | np.ndarray, debug: bool = False) -> ScreenState:
     """Detect current screen state from OCR text."""
-    text = get_text(image)
+    texts = get_texts(image)
 
     if debug:
-        print(f"[OCR] {text[:600]}...")
+        for name, text in texts.items():
+            print(f"[OCR] {name}: {text[:600]}...")
+
+    return match_screen_state(texts)
+
+
+def has_keyword(texts: dict[str, str], keyword: str) -> bool:
+    """
+    Check for a keyword in the OCR texts.
+    In region mode the keyword is only looked for in its region (OCR_KEYWORD_REGIONS);
+    in full-screen mode, in the whole screen text.
+    """
+    if FULL_SCREEN in texts:
+        return keyword in texts[FULL_SCREEN]
+    region = OCR_KEYWORD_REGIONS.get(keyword)
+    return region is not None and keyword in texts.get(region, "")
+
+
+def match_screen_state(texts: dict[str, str]) -> ScreenState:
+    """Match screen state keywords against the OCR text of each region."""
+
+    def has(*keywords: str) -> bool:
+        return any(has_keyword(texts, k) for k in keywords)
 
     # P6: Refresh confirmation popup
-    if "REFRESH THIS PLAYER" in text or "REFRESH THIS" in text:
+    if has("REFRESH THIS"):
         return ScreenState.P6_REFRESH_CONFIRM
 
     # P2: Reveal clue confirmation popup
-    if "REVEAL CLUE" in text or (
-        "YES" in text and "NO" in text and "REVEAL CLUE" in text
-    ):
+    if has("REVEAL CLUE"):
         return ScreenState.P2_CONFIRM
 
     # P4: Swipe to reveal screen (has "SWIPE TO REVEAL" text)
-    if "SWIPE TO REVEAL" in text or "SWIPE" in text:
+    if has("SWIPE"):
         return ScreenState.P4_SKIP
 
     # P3: Tile selection
-    if "PICK ANY CLUE BOX" in text or "PICK ANY CLUE" in text:
+    if has("PICK ANY CLUE"):
         return ScreenState.P3_TILES
 
     # P5: Result card - unique attributes only appear here
@@ -76,9 +183,9 @@ def detect_screen_state(image: str | np.ndarray, debug: bool = False) -> ScreenS
         "ANNIVERSARY",
         "PROGRAM",
     ]
-    if any(attr in text for attr in p5_unique):
+    if has(*p5_unique):
         # Make sure it's not P1 (which shows card preview)
-        if "STAR SCOUT" not in text and "POSSIBLE REWARDS" not in text:
+        if not has("STAR SCOUT", "POSSIBLE REWARDS"):
             return ScreenState.P5_RESULT
 
     # P5: Other attributes + no P1 indicators
@@ -94,21 +201,59 @@ def detect_screen_state(image: str | np.ndarray, debug: bool = False) -> ScreenS
         "OOVR",
         "0VR",
     ]
-    has_attr = any(attr in text for attr in p5_other)
-    if has_attr and "FREE REVEAL" not in text and "STAR SCOUT" not in text:
+    if has(*p5_other) and not has("FREE REVEAL", "STAR SCOUT"):
         return ScreenState.P5_RESULT
 
     # P1: Main screen
-    if "STAR SCOUT" in text and "FREE REVEAL" in text:
-        return ScreenState.P1_MAIN
-    if "POSSIBLE REWARDS" in text and "FREE REVEAL" in text:
+    if has("STAR SCOUT", "POSSIBLE REWARDS") and has("FREE REVEAL"):
         return ScreenState.P1_MAIN
 
     return ScreenState.UNKNOWN
 
 
-def extract_ovr(image: str | np.ndarray) -> int | None:
-    """Extract OVR number from result screen."""
+def card_gray(img: np.ndarray) -> np.ndarray:
+    """Crop the card center area, upscale it 3x and convert to grayscale."""
+    h, w = img.shape[:2]
+    card = img[int(h * 0.22) : int(h * 0.9), int(w * 0.25) : int(w * 0.72)]
+    scaled = cv2.resize(card, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
+    return cv2.cvtColor(scaled, cv2.COLOR_BGR2GRAY)
+
+
+def read_card_numbers(gray: np.ndarray, thresh_val: int) -> list[int]:
+    """Binarize the card at one threshold and return every 2-3 digit number read."""
+    _, thresh = cv2.threshold(gray, thresh_val, 255, cv2.THRESH_BINARY)
+    text = pytesseract.image_to_string(Image.fromarray(thresh), config="--psm 6")
+    return [int(n) for n in re.findall(r"\d{2,3}", text)]
+
+
+def read_full_numbers(img: np.ndarray) -> list[int]:
+    """OCR the whole screenshot and return every 2-3 digit number read."""
+    full_text = pytesseract.image_to_string(
+        Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    )
+    return [int(n) for n in re.findall(r"\d{2,3}", full_text)]
+
+
+def pick_ovr(numbers: list[int]) -> int | None:
+    """Pick the most common number in the valid OVR range (80-150)."""
+    valid = [n for n in numbers if 80 <= n <= 150]
+    if valid:
+        return Counter(valid).most_common(1)[0][0]
+    return None
+
+
+def extract_ovr(
+    image: str | np.ndarray,
+    thresholds: list[int] | None = None,
+    full_fallback: bool | None = None,
+) -> int | None:
+    """
+    Extract OVR number from result screen.
+    Args:
+        image: File path (str) or loaded OpenCV image (np.ndarray).
+        thresholds: Card binarization thresholds (default: OVR_THRESHOLDS).
+        full_fallback: Also OCR the full image (default: OVR_FULL_FALLBACK).
+    """
     if isinstance(image, str):
         img = cv2.imread(image)
     else:
@@ -117,35 +262,26 @@ def extract_ovr(image: str | np.ndarray) -> int | None:
     if img is None:
         return None
 
-    h, w = img.shape[:2]
+    if thresholds is None:
+        thresholds = OVR_THRESHOLDS
+    if full_fallback is None:
+        full_fallback = OVR_FULL_FALLBACK
+
     numbers = []
 
     # Card center area
-    card = img[int(h * 0.22) : int(h * 0.9), int(w * 0.25) : int(w * 0.72)]
-    scaled = cv2.resize(card, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
-    gray = cv2.cvtColor(scaled, cv2.COLOR_BGR2GRAY)
-
-    for thresh_val in [100, 120, 140]:
-        _, thresh = cv2.threshold(gray, thresh_val, 255, cv2.THRESH_BINARY)
-        text = pytesseract.image_to_string(Image.fromarray(thresh), config="--psm 6")
-        nums = re.findall(r"\d{2,3}", text)
-        numbers.extend([int(n) for n in nums])
+    gray = card_gray(img)
+    for thresh_val in thresholds:
+        numbers.extend(read_card_numbers(gray, thresh_val))
 
     # Full image fallback
-    full_text = pytesseract.image_to_string(
-        Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-    )
-    nums = re.findall(r"\d{2,3}", full_text)
-    numbers.extend([int(n) for n in nums])
+    if full_fallback:
+        numbers.extend(read_full_numbers(img))
 
-    # Filter valid OVR range (80-150)
-    valid = [n for n in numbers if 80 <= n <= 150]
-    if valid:
-        return Counter(valid).most_common(1)[0][0]
-    return None
+    return pick_ovr(numbers)
 
 
 def is_ovr_shown(image: str | np.ndarray) -> bool:
     """Check if OVR attribute is shown."""
-    text = get_text(image)
-    return any(p in text for p in ["OVR", "OOVR", "0VR", "OVVR"])
+    texts = get_texts(image)
+    return any(has_keyword(texts, p) for p in ["OVR", "OOVR", "0VR", "OVVR"])
@@ -0,0 +1,280 @@
+"""
+Session recorder and replay for Scout Bot.
+
+A session file is a magic line followed by records:
+
+    >II header_len payload_len | JSON header | payload
+
+Frames are stored as PNG keyframes every RECORD_KEYFRAME_INTERVAL frames and
+as PNG-encoded wrapping deltas against the previous frame in between, so the
+mostly static game UI compresses to a few KB per frame. Identical frames are
+stored with no payload at all.
+"""
+
+import json
+import queue
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .config import RECORD_SESSION, RECORD_DIR, RECORD_KEYFRAME_INTERVAL
+from .device import current_device
+
+MAGIC = b"SCOUTREC1\n"
+_RECORD_HEADER = struct.Struct(">II")
+_PNG_FAST = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+
+class Recorder:
+    """
+    Writes frames and decision events to a session file.
+    Records are queued by the bot thread and encoded / written by a background
+    thread, so recording never slows down the bot loop.
+    """
+
+    def __init__(self, path: Path, keyframe_interval: int):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.start_time = time.perf_counter()
+        self.frame_id = -1
+        self.prev_frame = None
+        self.keyframes = 0
+        self.frame_bytes = 0
+        self.failed = False
+        self.queue: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="scout-recorder", daemon=True)
+        self.thread.start()
+
+    def _elapsed(self) -> float:
+        return round(time.perf_counter() - self.start_time, 4)
+
+    def _write(self, header: dict, payload: bytes = b"") -> None:
+        data = json.dumps(header, separators=(",", ":")).encode()
+        self.file.write(_RECORD_HEADER.pack(len(data), len(payload)))
+        self.file.write(data)
+        self.file.write(payload)
+
+    def _encode_frame(self, header: dict, data: bytes | np.ndarray) -> bytes:
+        """Pick the frame kind and encode its payload. PNG bytes are stored as-is for keyframes."""
+        if isinstance(data, bytes):
+            img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        else:
+            img = data
+        if img is None:
+            # Unreadable capture: the next frame restarts from a keyframe
+            header["kind"] = "missing"
+            self.prev_frame = None
+            return b""
+
+        prev = self.prev_frame
+        self.prev_frame = img
+        if prev is None or prev.shape != img.shape or header["id"] % self.keyframe_interval == 0:
+            header["kind"] = "key"
+            self.keyframes += 1
+            if isinstance(data, bytes):
+                return data
+            return cv2.imencode(".png", img, _PNG_FAST)[1].tobytes()
+        if np.array_equal(prev, img):
+            header["kind"] = "same"
+            return b""
+        header["kind"] = "delta"
+        # uint8 arithmetic wraps, so prev + delta restores the frame exactly
+        return cv2.imencode(".png", img - prev, _PNG_FAST)[1].tobytes()
+
+    def _run(self) -> None:
+        try:
+            while (item := self.queue.get()) is not None:
+                header, data = item
+                if header["type"] != "frame":
+                    self._write(header)
+                    continue
+                payload = self._encode_frame(header, data)
+                self.frame_bytes += len(payload)
+                self._write(header, payload)
+                # A crash loses at most the record being written
+                self.file.flush()
+        except (OSError, TypeError, ValueError, cv2.error) as e:
+            self.failed = True
+            print(f"[WARN] Session recording failed: {e}")
+
+    def frame(self, image: str | np.ndarray) -> None:
+        """
+        Queue a captured frame; later events refer to it.
+        The capture file is overwritten by the next capture, so it is read here
+        and decoded on the writer thread.
+        """
+        if self.failed:
+            return
+        if isinstance(image, str):
+            try:
+                data = Path(image).read_bytes()
+            except OSError:
+                return
+        else:
+            data = image.copy()
+
+        self.frame_id += 1
+        self.queue.put(({"type": "frame", "id": self.frame_id, "t": self._elapsed()}, data))
+
+    def event(self, kind: str, value=None, started: float | None = None, **data) -> None:
+        """
+        Record an event on the current frame.
+        Args:
+            kind: Event type ("state", "ovr_shown", "ovr", "asset", "tap", ...).
+            value: The decision or value to record (must be JSON serializable).
+            started: perf_counter() taken before the detector ran, to record its duration.
+        """
+        if self.failed:
+            return
+        header = {"type": kind, "frame": self.frame_id, "value": value, **data, "t": self._elapsed()}
+        if started is not None:
+            header["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.queue.put((header, None))
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+        size_kb = self.path.stat().st_size / 1024
+        print(
+            f"[INFO] Session saved: {self.path} ({self.frame_id + 1} frames, "
+            f"{self.keyframes} keyframes, {size_kb:.0f} KB)"
+        )
+
+
+# Active recorder per device (None = default ADB device)
+_active: dict[str | None, Recorder] = {}
+
+
+def start() -> None:
+    """Start recording the current device if RECORD_SESSION is enabled."""
+    device = current_device()
+    if not RECORD_SESSION or device in _active:
+        return
+    RECORD_DIR.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = f"_{device.replace(':', '_')}" if device else ""
+    recorder = Recorder(RECORD_DIR / f"session_{ts}{suffix}.scout", RECORD_KEYFRAME_INTERVAL)
+    _active[device] = recorder
+    print(f"[INFO] Recording session to {recorder.path}")
+
+
+def stop() -> None:
+    """Stop recording the current device and close the session file."""
+    recorder = _active.pop(current_device(), None)
+    if recorder is not None:
+        recorder.close()
+
+
+def frame(image: str | np.ndarray) -> None:
+    """Record a frame if a session is being recorded."""
+    recorder = _active.get(current_device())
+    if recorder is not None:
+        recorder.frame(image)
+
+
+def event(kind: str, value=None, started: float | None = None, **data) -> None:
+    """Record an event if a session is being recorded."""
+    recorder = _active.get(current_device())
+    if recorder is not None:
+        recorder.event(kind, value, started, **data)
+
+
+def read_session(path: str | Path):
+    """
+    Iterate over a session file.
+    Yields (header, frame) where frame is the decoded current frame.
+    Stops at a trailing record that was only partly written (e.g. the bot was killed).
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a Scout session file: {path}")
+
+        current = None
+        while True:
+            raw = f.read(_RECORD_HEADER.size)
+            if not raw:
+                return
+            if len(raw) < _RECORD_HEADER.size:
+                print("[WARN] Session ends with a partial record")
+                return
+            header_len, payload_len = _RECORD_HEADER.unpack(raw)
+            header_raw = f.read(header_len)
+            payload = f.read(payload_len)
+            if len(header_raw) < header_len or len(payload) < payload_len:
+                print("[WARN] Session ends with a partial record")
+                return
+            header = json.loads(header_raw)
+
+            if header["type"] == "frame":
+                if header["kind"] == "key":
+                    current = cv2.imdecode(np.frombuffer(payload, np.uint8), cv2.IMREAD_COLOR)
+                elif header["kind"] == "delta":
+                    delta = cv2.imdecode(np.frombuffer(payload, np.uint8), cv2.IMREAD_COLOR)
+                    if current is None or delta is None or delta.shape != current.shape:
+                        current = None
+                    else:
+                        current = current + delta
+                elif header["kind"] == "missing":
+                    current = None
+
+            yield header, current
+
+
+def replay(path: str | Path) -> int:
+    """
+    Re-run the current detectors over a recorded session at full speed.
+    Prints every decision that differs. Returns the number of differences.
+    """
+    from .bot import TEMPLATES
+    from .ocr import detect_screen_state, extract_ovr, is_ovr_shown
+    from .utils import check_if_image_exists
+
+    detectors = {
+        "state": lambda img: detect_screen_state(img).name,
+        "ovr_shown": is_ovr_shown,
+        "ovr": extract_ovr,
+        "asset": lambda img: check_if_image_exists(img, TEMPLATES)[0],
+    }
+
+    checked = 0
+    diffs = 0
+    recorded_ms = 0.0
+    replay_ms = 0.0
+    iteration = 0
+    start_time = time.perf_counter()
+
+    for header, img in read_session(path):
+        kind = header["type"]
+        if kind == "iteration":
+            iteration = header["value"]
+            continue
+        if kind not in detectors or img is None:
+            continue
+
+        started = time.perf_counter()
+        value = detectors[kind](img)
+        replay_ms += (time.perf_counter() - started) * 1000
+        recorded_ms += header.get("ms", 0.0)
+        checked += 1
+
+        if value != header["value"]:
+            diffs += 1
+            print(
+                f"  [DIFF] iter {iteration} frame {header['frame']} {kind}: "
+                f"recorded {header['value']}, now {value}"
+            )
+
+    print(f"\n{'='*40}")
+    print(f"Replayed {checked} decisions in {time.perf_counter() - start_time:.1f}s")
+    print(f"Differences: {diffs}")
+    print(f"Detector time: recorded {recorded_ms/1000:.1f}s, now {replay_ms/1000:.1f}s")
+    print(f"{'='*40}")
+    return diffs
@@ -0,0 +1,294 @@
+"""
+Offline detector tuner for Scout Bot.
+
+Sweeps the OVR binarization thresholds, MATCH_THRESHOLD and the template
+scale range over a folder of labelled screenshots, using a process pool.
+
+Labels live in `labels.json` inside the folder, keyed by file name:
+
+    {
+        "result_001.png": {"ovr": 114},
+        "result_002.png": {"ovr": null},
+        "dismissed_icon.png": {"asset": true},
+        "dismissed_plain.png": {"asset": false}
+    }
+
+"ovr" images are P5 result screens (null = OVR should not be read).
+"asset" images are the screen captured after dismissing the card.
+
+Each screenshot is OCR'd / matched once per distinct threshold or template
+size, so the cost of a sweep grows with the number of distinct values,
+not with the number of settings.
+"""
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .config import (
+    TARGET_OVR_MIN,
+    TARGET_OVR_MAX,
+    MATCH_THRESHOLD,
+    OVR_THRESHOLDS,
+    OVR_FULL_FALLBACK,
+    TEMPLATE_SCALE_MIN,
+    TEMPLATE_SCALE_MAX,
+    TEMPLATE_SCALE_STEPS,
+)
+from .ocr import card_gray, read_card_numbers, read_full_numbers, pick_ovr
+from .utils import crop_check_region, template_scales, template_size
+
+# ==================== SWEEP GRID ====================
+
+# Candidate card thresholds; every combination of 1-3 of them is tried
+OVR_THRESHOLD_CANDIDATES = [80, 100, 120, 140, 160]
+
+# Candidate MATCH_THRESHOLD values
+MATCH_THRESHOLD_CANDIDATES = [round(t, 2) for t in np.arange(0.40, 0.76, 0.03)]
+
+# Candidate template scale ranges (min, max, steps)
+SCALE_RANGE_CANDIDATES = [
+    (0.6, 1.4, 40),
+    (0.6, 1.4, 20),
+    (0.7, 1.3, 25),
+    (0.7, 1.3, 13),
+    (0.8, 1.2, 17),
+    (0.8, 1.2, 9),
+    (0.9, 1.1, 5),
+]
+
+LABELS_FILE = "labels.json"
+
+# Per-process cache of resized gray templates: (name, w, h) -> (template, seconds)
+_scaled_templates: dict[tuple[str, int, int], tuple[np.ndarray, float]] = {}
+_gray_templates: list[tuple[str, np.ndarray]] = []
+
+
+def _init_worker(templates: list[tuple[str, np.ndarray]]) -> None:
+    """Convert the templates to grayscale once per worker process."""
+    _gray_templates.clear()
+    _scaled_templates.clear()
+    for name, template in templates:
+        _gray_templates.append((name, cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)))
+
+
+def _scaled_template(name: str, template_gray: np.ndarray, w: int, h: int) -> tuple[np.ndarray, float]:
+    """Resize a template, reusing the result across images and sweep points."""
+    key = (name, w, h)
+    if key not in _scaled_templates:
+        start = time.perf_counter()
+        resized = cv2.resize(template_gray, (w, h), interpolation=cv2.INTER_AREA)
+        _scaled_templates[key] = (resized, time.perf_counter() - start)
+    return _scaled_templates[key]
+
+
+def _sweep_ovr_image(path: str) -> dict | None:
+    """
+    OCR one result screenshot at every candidate threshold (plus the full-image
+    fallback) and evaluate every threshold combination from those cached reads.
+    Returns {(thresholds, full_fallback): (ovr, seconds)}.
+    """
+    img = cv2.imread(path)
+    if img is None:
+        return None
+
+    start = time.perf_counter()
+    gray = card_gray(img)
+    prep_time = time.perf_counter() - start
+
+    reads = {}
+    for thresh_val in OVR_THRESHOLD_CANDIDATES:
+        start = time.perf_counter()
+        reads[thresh_val] = (read_card_numbers(gray, thresh_val), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    full_numbers = read_full_numbers(img)
+    full_time = time.perf_counter() - start
+
+    results = {}
+    for size in range(1, 4):
+        for combo in combinations(OVR_THRESHOLD_CANDIDATES, size):
+            numbers = [n for t in combo for n in reads[t][0]]
+            elapsed = prep_time + sum(reads[t][1] for t in combo)
+            results[(combo, False)] = (pick_ovr(numbers), elapsed)
+            results[(combo, True)] = (pick_ovr(numbers + full_numbers), elapsed + full_time)
+    return results
+
+
+def _sweep_asset_image(path: str) -> dict | None:
+    """
+    Match every template at every distinct size needed by the scale candidates,
+    then replay check_if_image_exists' early-exit loop for each setting.
+    Returns {(scale_range, threshold): (found, seconds)}.
+    """
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+
+    region = crop_check_region(img)
+    if region is None:
+        return None
+    region_gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+
+    # (name, w, h) -> (confidence, seconds), shared by all scale ranges
+    matches: dict[tuple[str, int, int], tuple[float, float]] = {}
+
+    def match(name: str, template_gray: np.ndarray, w: int, h: int) -> tuple[float, float]:
+        key = (name, w, h)
+        if key not in matches:
+            resized, resize_time = _scaled_template(name, template_gray, w, h)
+            start = time.perf_counter()
+            result = cv2.matchTemplate(region_gray, resized, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, _ = cv2.minMaxLoc(result)
+            matches[key] = (max_val, resize_time + time.perf_counter() - start)
+        return matches[key]
+
+    results = {}
+    for scale_range in SCALE_RANGE_CANDIDATES:
+        # Ordered (confidence, seconds) per template, as the bot would visit them
+        visits = []
+        for name, template_gray in _gray_templates:
+            for scale_percent in template_scales(*scale_range):
+                size = template_size(template_gray.shape, region_gray.shape, scale_percent)
+                if size is not None:
+                    visits.append(match(name, template_gray, *size))
+
+        for threshold in MATCH_THRESHOLD_CANDIDATES:
+            found = False
+            elapsed = 0.0
+            for confidence, seconds in visits:
+                elapsed += seconds
+                if confidence >= threshold:
+                    found = True
+                    break
+            results[(scale_range, threshold)] = (found, elapsed)
+    return results
+
+
+def _is_target_ovr(ovr: int | None) -> bool:
+    return ovr is not None and TARGET_OVR_MIN <= ovr <= TARGET_OVR_MAX
+
+
+def _score(samples: list[tuple[object, dict]], is_target, is_correct) -> list[dict]:
+    """Aggregate per-image sweep results into one row per setting."""
+    rows = {}
+    for expected, results in samples:
+        for setting, (predicted, elapsed) in results.items():
+            row = rows.setdefault(
+                setting, {"setting": setting, "time": 0.0, "errors": 0, "missed": 0, "false": 0}
+            )
+            row["time"] += elapsed
+            if not is_correct(expected, predicted):
+                row["errors"] += 1
+            if is_target(expected) and not is_target(predicted):
+                row["missed"] += 1
+            elif is_target(predicted) and not is_target(expected):
+                row["false"] += 1
+
+    for row in rows.values():
+        row["time"] /= len(samples)
+        row["accuracy"] = 1 - row["errors"] / len(samples)
+    return list(rows.values())
+
+
+def pareto_front(rows: list[dict]) -> list[dict]:
+    """Settings not beaten on both mean latency and error count, fastest first."""
+    front = []
+    best_errors = None
+    for row in sorted(rows, key=lambda r: (r["time"], r["errors"])):
+        if best_errors is None or row["errors"] < best_errors:
+            front.append(row)
+            best_errors = row["errors"]
+    return front
+
+
+def _print_report(title: str, rows: list[dict], current, describe) -> None:
+    print(f"\n{'='*40}")
+    print(title)
+    print(f"{'='*40}")
+
+    front = pareto_front(rows)
+    print(f"Pareto front ({len(front)} of {len(rows)} settings):")
+    for row in front:
+        print(
+            f"  {row['time']*1000:8.1f} ms  acc {row['accuracy']:.2%}  "
+            f"missed {row['missed']}  false {row['false']}  {describe(row['setting'])}"
+        )
+
+    for row in rows:
+        if row["setting"] == current:
+            print(
+                f"Current:  {row['time']*1000:8.1f} ms  acc {row['accuracy']:.2%}  "
+                f"missed {row['missed']}  false {row['false']}  {describe(current)}"
+            )
+
+    safe = [r for r in rows if r["missed"] == 0]
+    if safe:
+        best = min(safe, key=lambda r: (r["time"], r["false"], r["errors"]))
+        print(f"Fastest with zero missed targets: {describe(best['setting'])} ({best['time']*1000:.1f} ms)")
+    else:
+        print("[WARN] No setting keeps zero missed targets")
+
+
+def _describe_ovr(setting) -> str:
+    thresholds, full_fallback = setting
+    return f"OVR_THRESHOLDS={list(thresholds)} OVR_FULL_FALLBACK={full_fallback}"
+
+
+def _describe_asset(setting) -> str:
+    (scale_min, scale_max, steps), threshold = setting
+    return (
+        f"MATCH_THRESHOLD={threshold} TEMPLATE_SCALE_MIN={scale_min} "
+        f"TEMPLATE_SCALE_MAX={scale_max} TEMPLATE_SCALE_STEPS={steps}"
+    )
+
+
+def run_tune(folder: str, workers: int | None = None) -> None:
+    """Sweep detector settings over the labelled screenshots in `folder`."""
+    from .bot import TEMPLATES
+
+    directory = Path(folder)
+    labels_path = directory / LABELS_FILE
+    if not labels_path.is_file():
+        print(f"[ERROR] Labels not found: {labels_path}")
+        return
+
+    labels = json.loads(labels_path.read_text())
+    ovr_items = [(directory / name, label["ovr"]) for name, label in labels.items() if "ovr" in label]
+    asset_items = [(directory / name, label["asset"]) for name, label in labels.items() if "asset" in label]
+    print(f"[INFO] {len(ovr_items)} OVR screenshots, {len(asset_items)} asset screenshots")
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(TEMPLATES,)
+    ) as pool:
+        ovr_results = pool.map(_sweep_ovr_image, [str(p) for p, _ in ovr_items])
+        asset_results = pool.map(_sweep_asset_image, [str(p) for p, _ in asset_items])
+
+        ovr_samples = []
+        for (path, expected), results in zip(ovr_items, ovr_results):
+            if results is None:
+                print(f"[WARN] Skipped: {path}")
+                continue
+            ovr_samples.append((expected, results))
+
+        asset_samples = []
+        for (path, expected), results in zip(asset_items, asset_results):
+            if results is None:
+                print(f"[WARN] Skipped: {path}")
+                continue
+            asset_samples.append((bool(expected), results))
+
+    if ovr_samples:
+        rows = _score(ovr_samples, _is_target_ovr, lambda expected, predicted: expected == predicted)
+        current = (tuple(OVR_THRESHOLDS), OVR_FULL_FALLBACK)
+        _print_report("OVR reading (handle_p5)", rows, current, _describe_ovr)
+
+    if asset_samples:
+        rows = _score(asset_samples, bool, lambda expected, predicted: expected == predicted)
+        current = ((TEMPLATE_SCALE_MIN, TEMPLATE_SCALE_MAX, TEMPLATE_SCALE_STEPS), round(MATCH_THRESHOLD, 2))
+        _print_report("Special asset detection (dismiss_and_check)", rows, current, _describe_asset)
@@ -8,6 +8,8 @@ import time
 import cv2
 import numpy as np
 import platform
+from . import recorder
+from .device import adb, current_device
 from .config import (
     CLICK_DELAY,
     ALERT_SOUND,
@@ -16,6 +18,9 @@ from .config import (
     CHECK_Y1,
     CHECK_Y2,
     MATCH_THRESHOLD,
+    TEMPLATE_SCALE_MIN,
+    TEMPLATE_SCALE_MAX,
+    TEMPLATE_SCALE_STEPS,
 )
 
 
@@ -28,20 +33,26 @@ def run_cmd(cmd: str, capture: bool = True) -> str:
     return ""
 
 
-def capture_screen(path: str = "screen.png") -> str:
+def capture_screen(path: str | None = None) -> str:
     """Capture screen via ADB."""
+    if path is None:
+        serial = current_device()
+        path = f"screen_{serial.replace(':', '_')}.png" if serial else "screen.png"
+
     # Use current directory or temp directory if path is just a filename
     if not Path(path).is_absolute():
         path = str(Path(path).resolve())
         
-    run_cmd(f"adb exec-out screencap -p > \"{path}\"", capture=False)
+    run_cmd(f"{adb('exec-out screencap -p')} > \"{path}\"", capture=False)
     time.sleep(0.2)
+    recorder.frame(path)
     return path
 
 
 def tap(x: int, y: int) -> None:
     """Tap at coordinates via ADB (direct coordinates, no conversion)."""
-    run_cmd(f"adb shell input tap {int(x)} {int(y)}", capture=False)
+    run_cmd(adb(f"shell input tap {int(x)} {int(y)}"), capture=False)
+    recorder.event("tap", [int(x), int(y)])
     time.sleep(CLICK_DELAY)
 
 
@@ -91,8 +102,54 @@ def load_templates(directory: Path) -> list[tuple[str, np.ndarray]]:
     return templates
 
 
+def template_scales(
+    scale_min: float | None = None,
+    scale_max: float | None = None,
+    steps: int | None = None,
+) -> np.ndarray:
+    """
+    Scales tried for each template, relative to the check region height.
+    Defaults to TEMPLATE_SCALE_MIN, TEMPLATE_SCALE_MAX and TEMPLATE_SCALE_STEPS.
+    """
+    return np.linspace(
+        TEMPLATE_SCALE_MIN if scale_min is None else scale_min,
+        TEMPLATE_SCALE_MAX if scale_max is None else scale_max,
+        TEMPLATE_SCALE_STEPS if steps is None else steps,
+    )
+
+
+def template_size(
+    template_shape: tuple[int, ...], region_shape: tuple[int, ...], scale_percent: float
+) -> tuple[int, int] | None:
+    """
+    Size (w, h) of a template scaled to `scale_percent` of the region height.
+    Returns None if the scaled template does not fit in the region.
+    """
+    # Resize template to match the height of the region for a baseline
+    scale = region_shape[0] / template_shape[0]
+    w = int(int(template_shape[1] * scale) * scale_percent)
+    h = int(int(template_shape[0] * scale) * scale_percent)
+
+    if w > region_shape[1] or h > region_shape[0] or w < 5 or h < 5:
+        return None
+    return w, h
+
+
+def crop_check_region(main_image: np.ndarray) -> np.ndarray | None:
+    """Crop the CHECK_ region from a screenshot. Returns None if out of bounds."""
+    h, w = main_image.shape[:2]
+    if CHECK_X2 > w or CHECK_Y2 > h:
+        print(f"[WARN] Check region ({CHECK_X1},{CHECK_Y1},{CHECK_X2},{CHECK_Y2}) is out of bounds for image size {w}x{h}")
+        return None
+    return main_image[CHECK_Y1:CHECK_Y2, CHECK_X1:CHECK_X2]
+
+
 def check_if_image_exists(
-    screenshot: str | np.ndarray, templates: list[tuple[str, np.ndarray]], debug: bool = False
+    screenshot: str | np.ndarray,
+    templates: list[tuple[str, np.ndarray]],
+    debug: bool = False,
+    threshold: float | None = None,
+    scales: np.ndarray | None = None,
 ) -> tuple[bool, float]:
     """
     Check if any of the template images exist in the specified region of the screenshot.
@@ -101,6 +158,8 @@ def check_if_image_exists(
         screenshot: Path to the screenshot file or loaded OpenCV image.
         templates: A list of (name, image_data) tuples.
         debug: If True, save debug images and print confidence scores.
+        threshold: Minimum confidence for a match (default: MATCH_THRESHOLD).
+        scales: Template scales to try (default: template_scales()).
     Returns:
         (found, max_confidence):
             found: True if a match is found, False otherwise.
@@ -117,12 +176,13 @@ def check_if_image_exists(
         print(f"[ERROR] Could not load screenshot: {img_name}")
         return False, 0.0
 
-    h, w = main_image.shape[:2]
     if debug:
+        h, w = main_image.shape[:2]
         print(f"  [DEBUG] Screenshot size: {w}x{h}")
 
-    if CHECK_X2 > w or CHECK_Y2 > h:
-        print(f"[WARN] Check region ({CHECK_X1},{CHECK_Y1},{CHECK_X2},{CHECK_Y2}) is out of bounds for image size {w}x{h}")
+    # Crop the main image to the specified check region
+    region_color = crop_check_region(main_image)
+    if region_color is None:
         return False, 0.0
 
     if debug:
@@ -131,13 +191,16 @@ def check_if_image_exists(
         DEBUG_SAVE_DIR.mkdir(parents=True, exist_ok=True)
         print(f"  [DEBUG] Saving debug images to: {DEBUG_SAVE_DIR}")
 
-    # Crop the main image to the specified check region
-    region_color = main_image[CHECK_Y1:CHECK_Y2, CHECK_X1:CHECK_X2]
     region_gray = cv2.cvtColor(region_color, cv2.COLOR_BGR2GRAY)
 
     if debug:
         cv2.imwrite(str(DEBUG_SAVE_DIR / "region.png"), region_gray)
 
+    if threshold is None:
+        threshold = MATCH_THRESHOLD
+    if scales is None:
+        scales = template_scales()
+
     global_max_val = 0.0
 
     for t_name, template_color in templates:
@@ -145,18 +208,11 @@ def check_if_image_exists(
 
         best_match_val = -1
 
-        # Resize template to match the height of the region for a baseline
-        scale = region_gray.shape[0] / template_gray.shape[0]
-        base_w = int(template_gray.shape[1] * scale)
-        base_h = int(template_gray.shape[0] * scale)
-
-        # Test scales from 60% to 140% of the baseline height
-        for i, scale_percent in enumerate(np.linspace(0.6, 1.4, 40)):
-            w = int(base_w * scale_percent)
-            h = int(base_h * scale_percent)
-
-            if w > region_gray.shape[1] or h > region_gray.shape[0] or w < 5 or h < 5:
+        for scale_percent in scales:
+            size = template_size(template_gray.shape, region_gray.shape, scale_percent)
+            if size is None:
                 continue
+            w, h = size
 
             resized_template = cv2.resize(
                 template_gray, (w, h), interpolation=cv2.INTER_AREA
@@ -169,7 +225,7 @@ def check_if_image_exists(
             if max_val > best_match_val:
                 best_match_val = max_val
 
-            if max_val >= MATCH_THRESHOLD:
+            if max_val >= threshold:
                 print(
                     f"  [FOUND] Template '{t_name}' "
                     f"with confidence: {max_val:.2f}"
@@ -201,14 +257,28 @@ def check_if_image_exists(
     return False, global_max_val
 
 
-def check_adb_connection() -> bool:
-    """Check ADB connection."""
+def get_device_id() -> str:
+    """Serial number of the connected ADB device."""
+    return run_cmd(adb("get-serialno")) or "unknown"
+
+
+def list_devices() -> list[str]:
+    """Serials of all connected ADB devices."""
     result = run_cmd("adb devices")
     lines = result.strip().split("\n")
-    devices = [line for line in lines[1:] if line.strip() and "device" in line]
-    
+    return [
+        line.split()[0]
+        for line in lines[1:]
+        if line.strip() and line.split()[-1] == "device"
+    ]
+
+
+def check_adb_connection() -> bool:
+    """Check ADB connection."""
+    devices = list_devices()
+
     if devices:
-        print(f"[OK] ADB: {devices[0].split()[0]}")
+        print(f"[OK] ADB: {devices[0]}")
         return True
     print("[ERROR] No ADB device!")
     return False
\ No newline at end of file